@@ -7,6 +7,11 @@ from pathlib import Path
 from .config import Config
 from .lib import Daemon
 
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locking available
+    fcntl = None
+
 
 def set_prompts_dir(path: Path, config_path: Path | None = None) -> str:
     """Set the prompts directory."""
@@ -53,15 +58,34 @@ def get_prompt(prompt_name: str, config_path: Path | None = None) -> str:
     return config.load_prompt(prompt_name)
 
 
-def start_daemon(config_path: Path | None = None) -> None:
-    """Start the hotkey daemon."""
-    daemon = Daemon()
+def start_daemon(
+    config_path: Path | list[Path] | None = None, profile: str | None = None
+) -> None:
+    """Start the hotkey daemon serving one config, or several as profiles."""
+    config_paths = [config_path] if isinstance(config_path, str | Path) else config_path
+    daemon = Daemon(config_paths, profile)
     daemon.run()
 
 
-def stop_daemon(config_path: Path | None = None) -> str:
-    """Stop the hotkey daemon."""
-    config = Config(config_path)
+def _daemon_holds_lock(pid_file: Path) -> bool:
+    """Check whether a running daemon holds the lock on its PID file."""
+    if fcntl is None:
+        return True
+    with open(pid_file) as f:
+        try:
+            fcntl.flock(f, fcntl.LOCK_SH | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return True
+        fcntl.flock(f, fcntl.LOCK_UN)
+        return False
+
+
+def _signal_daemon(config: Config, signum: int) -> int:
+    """Send a signal to the daemon serving a config and return its PID.
+
+    Refuses (and removes the PID file) when no daemon holds the PID file's lock,
+    so a stale file never leads to signalling an unrelated process.
+    """
     pid_file = config.pid_file_path
 
     if not pid_file.exists():
@@ -73,11 +97,51 @@ def stop_daemon(config_path: Path | None = None) -> str:
     except (OSError, ValueError) as e:
         raise ValueError(f"Error reading PID file {pid_file}: {e}") from e
 
+    if not _daemon_holds_lock(pid_file):
+        pid_file.unlink(missing_ok=True)
+        raise ValueError(f"Daemon not running (removed stale PID file {pid_file}).")
+
     try:
-        os.kill(pid, signal.SIGTERM)
-        return f"Sent SIGTERM to daemon (PID: {pid})."
+        os.kill(pid, signum)
     except ProcessLookupError as e:
         pid_file.unlink(missing_ok=True)
         raise ValueError("Daemon not running.") from e
     except Exception as e:
-        raise ValueError(f"Error stopping daemon (PID: {pid}): {e}") from e
+        raise ValueError(f"Error signalling daemon (PID: {pid}): {e}") from e
+    return pid
+
+
+def stop_daemon(config_path: Path | None = None) -> str:
+    """Stop the hotkey daemon."""
+    pid = _signal_daemon(Config(config_path), signal.SIGTERM)
+    return f"Sent SIGTERM to daemon (PID: {pid})."
+
+
+def switch_profile(config_path: Path | None = None) -> str:
+    """Make the running daemon switch to the profile of the given config."""
+    if not hasattr(signal, "SIGUSR2"):
+        raise ValueError("Profile switching requires SIGUSR2 (not available on this platform).")
+
+    config = Config(config_path)
+    config.switch_file_path.touch()
+    try:
+        pid = _signal_daemon(config, signal.SIGUSR2)
+    except ValueError:
+        config.switch_file_path.unlink(missing_ok=True)
+        raise
+    return f"Switched daemon (PID: {pid}) to profile '{config.profile}'."
+
+
+def dump_daemon(config_path: Path | None = None) -> str:
+    """Ask the running daemon to dump its flight recorder."""
+    if not hasattr(signal, "SIGUSR1"):
+        raise ValueError("Flight recorder dump requires SIGUSR1 (not available on this platform).")
+
+    config = Config(config_path)
+    config.dump_file_path.touch()
+    try:
+        pid = _signal_daemon(config, signal.SIGUSR1)
+    except ValueError:
+        config.dump_file_path.unlink(missing_ok=True)
+        raise
+    return f"Requested flight recorder dump (PID: {pid}) → {config.flight_log_path}"
@@ -42,8 +42,8 @@ def add(
         raise typer.Exit(1) from e
 
 
-@app.command()
-def list(
+@app.command("list")
+def list_bindings(
     config: Path | None = typer.Option(None, "--config", "-c", help="Config file path"),
 ) -> None:
     """List all key bindings."""
@@ -99,11 +99,36 @@ def show(
 
 @app.command()
 def start(
-    config: Path | None = typer.Option(None, "--config", "-c", help="Config file path"),
+    config: list[Path] | None = typer.Option(
+        None,
+        "--config",
+        "-c",
+        help="Config file path. Repeat to serve several profiles from one daemon.",
+    ),
+    profile: str | None = typer.Option(
+        None, "--profile", "-p", help="Initially active profile (config file name)"
+    ),
 ) -> None:
     """Start the hotkey daemon."""
     typer.echo("Starting keys daemon...")
-    api.start_daemon(config)
+    try:
+        api.start_daemon(config, profile)
+    except ValueError as e:
+        typer.echo(f"Error: {e}", err=True)
+        raise typer.Exit(1) from e
+
+
+@app.command()
+def switch(
+    config: Path | None = typer.Option(None, "--config", "-c", help="Config file path"),
+) -> None:
+    """Switch the running daemon to the profile of the given config."""
+    try:
+        message = api.switch_profile(config)
+        typer.echo(message)
+    except ValueError as e:
+        typer.echo(f"Error: {e}", err=True)
+        raise typer.Exit(1) from e
 
 
 @app.command()
@@ -119,5 +144,18 @@ def stop(
         raise typer.Exit(1) from e
 
 
+@app.command()
+def dump(
+    config: Path | None = typer.Option(None, "--config", "-c", help="Config file path"),
+) -> None:
+    """Dump the daemon's recent event log to a JSON file."""
+    try:
+        message = api.dump_daemon(config)
+        typer.echo(message)
+    except ValueError as e:
+        typer.echo(f"Error: {e}", err=True)
+        raise typer.Exit(1) from e
+
+
 if __name__ == "__main__":
     app()
@@ -1,16 +1,36 @@
 """Configuration management."""
 
+import copy
+import os
+import stat
+from collections.abc import Iterator
+from contextlib import contextmanager
 from pathlib import Path
 from typing import Any
 
 import yaml
 
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locking available
+    fcntl = None
+
+
+class ConfigConflictError(Exception):
+    """Raised when saving a config that was changed on disk since it was loaded."""
+
 
 class Config:
-    """Load and parse keys configuration."""
+    """Load and parse keys configuration.
+
+    Writes hold an advisory lock on a sidecar lock file and replace the config
+    atomically via rename, so concurrent writers never lose updates or leave a
+    half-written file. Every write bumps a ``generation`` counter.
+    """
 
     def __init__(self, path: Path | None = None):
         self.path = path or Path.home() / ".keys" / "config.yaml"
+        self._stamp: tuple[int, int, int] | None = None
         self._data = self._load()
 
     def _load(self) -> dict[str, Any]:
@@ -18,22 +38,120 @@ class Config:
         self.path.parent.mkdir(parents=True, exist_ok=True)
 
         if not self.path.exists():
-            default_data = {
-                "prompts_dir": str(Path.home() / ".keys" / "prompts"),
-                "hotkeys": {},
-            }
-            with open(self.path, "w") as f:
-                yaml.safe_dump(default_data, f)
-            return default_data
-
+            with self._lock():
+                if not self.path.exists():
+                    default_data = {
+                        "prompts_dir": str(Path.home() / ".keys" / "prompts"),
+                        "hotkeys": {},
+                    }
+                    self._write(default_data)
+                    return default_data
+
+        return self._read()
+
+    def _read(self) -> dict[str, Any]:
+        """Parse the config file and remember which version of it was read."""
         with open(self.path) as f:
+            st = os.fstat(f.fileno())
             data = yaml.safe_load(f)
-            return data or {}
+        self._stamp = (st.st_ino, st.st_mtime_ns, st.st_size)
+        return data or {}
+
+    def _write(self, data: dict[str, Any]) -> None:
+        """Atomically replace the config file. Caller must hold the lock.
+
+        Writes next to the resolved path so a symlinked config stays a symlink,
+        and keeps the existing file's permissions.
+        """
+        target = self.path.resolve()
+        tmp_path = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+        try:
+            with open(tmp_path, "w") as f:
+                if target.exists():
+                    os.chmod(tmp_path, stat.S_IMODE(target.stat().st_mode))
+                yaml.safe_dump(data, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, target)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        st = target.stat()
+        self._stamp = (st.st_ino, st.st_mtime_ns, st.st_size)
+
+    @contextmanager
+    def _lock(self) -> Iterator[None]:
+        """Hold an exclusive advisory lock on the config's lock file."""
+        with open(self.lock_path, "a") as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    @contextmanager
+    def update(self) -> Iterator[dict[str, Any]]:
+        """Read-modify-write the config under the lock.
+
+        The latest on-disk data is reloaded and yielded for modification, then
+        saved with the next generation when the block exits without error. If
+        the block leaves the data unchanged, nothing is written; if the block or
+        the write fails, the in-memory data is rolled back.
+        """
+        with self._lock():
+            self._data = self._read()
+            before = copy.deepcopy(self._data)
+            try:
+                yield self._data
+                if self._data == before:
+                    return
+                self._data["generation"] = self.generation + 1
+                self._write(self._data)
+            except BaseException:
+                self._data = before
+                raise
 
     def save(self) -> None:
-        """Write config back to file."""
-        with open(self.path, "w") as f:
-            yaml.safe_dump(self._data, f)
+        """Write config back to file.
+
+        Raises:
+            ConfigConflictError: If another writer saved since this config was loaded.
+        """
+        with self._lock():
+            with open(self.path) as f:
+                on_disk = yaml.safe_load(f) or {}
+            if on_disk.get("generation", 0) != self.generation:
+                raise ConfigConflictError(
+                    f"Config changed on disk (generation {on_disk.get('generation', 0)}, "
+                    f"expected {self.generation}): {self.path}"
+                )
+            self._data["generation"] = self.generation + 1
+            self._write(self._data)
+
+    def changed(self) -> bool:
+        """Check whether the file was replaced since it was last read (stat only)."""
+        try:
+            st = self.path.stat()
+        except FileNotFoundError:
+            return True
+        return (st.st_ino, st.st_mtime_ns, st.st_size) != self._stamp
+
+    def reload(self) -> None:
+        """Reread the config file."""
+        self._data = self._read()
+
+    @property
+    def generation(self) -> int:
+        """Get the write counter of the loaded config."""
+        return self._data.get("generation", 0)
+
+    @property
+    def lock_path(self) -> Path:
+        """Get the path of the advisory lock file guarding writes."""
+        target = self.path.resolve()
+        return target.parent / f"{target.name}.lock"
 
     @property
     def prompts_dir(self) -> Path:
@@ -43,8 +161,8 @@ class Config:
 
     def set_prompts_dir(self, path: Path) -> None:
         """Set prompts directory."""
-        self._data["prompts_dir"] = str(path.expanduser())
-        self.save()
+        with self.update() as data:
+            data["prompts_dir"] = str(path.expanduser())
 
     @property
     def hotkeys(self) -> dict[str, str]:
@@ -57,14 +175,13 @@ class Config:
 
     def add_hotkey(self, key: str, prompt_name: str) -> None:
         """Add a hotkey binding."""
-        self._data.setdefault("hotkeys", {})[key] = prompt_name
-        self.save()
+        with self.update() as data:
+            data.setdefault("hotkeys", {})[key] = prompt_name
 
     def remove_hotkey(self, key: str) -> None:
         """Remove a hotkey binding."""
-        if "hotkeys" in self._data and key in self._data["hotkeys"]:
-            del self._data["hotkeys"][key]
-            self.save()
+        with self.update() as data:
+            data.get("hotkeys", {}).pop(key, None)
 
     def load_prompt(self, name: str) -> str:
         """Load prompt content from file."""
@@ -73,7 +190,33 @@ class Config:
             raise FileNotFoundError(f"Prompt not found: {prompt_path}")
         return prompt_path.read_text().strip()
 
+    @property
+    def profile(self) -> str:
+        """Get the profile name (config file name without extension)."""
+        return self.path.stem
+
+    def _profile_path(self, name: str, suffix: str) -> Path:
+        """Build a per-profile state file path next to the config file."""
+        if self.profile == "config":
+            return self.path.parent / f"{name}.{suffix}"
+        return self.path.parent / f"{name}.{self.profile}.{suffix}"
+
     @property
     def pid_file_path(self) -> Path:
         """Get the path for the daemon PID file."""
-        return self.path.parent / "keys_daemon.pid"
+        return self._profile_path("keys_daemon", "pid")
+
+    @property
+    def switch_file_path(self) -> Path:
+        """Get the path used to request switching the daemon to this profile."""
+        return self._profile_path("keys_daemon", "switch")
+
+    @property
+    def dump_file_path(self) -> Path:
+        """Get the path used to request a flight recorder dump to this profile's log."""
+        return self._profile_path("keys_daemon", "dump")
+
+    @property
+    def flight_log_path(self) -> Path:
+        """Get the path the daemon dumps its flight recorder to."""
+        return self._profile_path("keys_flight", "json")
@@ -1,10 +1,17 @@
 """Library utilities for system integration."""
 
-from .clipboard import get_clipboard, paste, set_clipboard
+from .clipboard import ClipboardRestorer, get_clipboard, paste, set_clipboard
 from .renderer import PromptRenderer
 
 # Daemon is imported lazily to avoid pynput X display issues in testing
-__all__ = ["get_clipboard", "set_clipboard", "paste", "Daemon", "PromptRenderer"]
+__all__ = [
+    "ClipboardRestorer",
+    "get_clipboard",
+    "set_clipboard",
+    "paste",
+    "Daemon",
+    "PromptRenderer",
+]
 
 
 def __getattr__(name):
@@ -2,6 +2,14 @@
 
 import platform
 import subprocess
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .recorder import FlightRecorder
 
 
 def get_clipboard() -> str:
@@ -52,3 +60,107 @@ def paste() -> None:
         )
     else:
         raise NotImplementedError(f"Platform not supported: {system}")
+
+
+@dataclass
+class _PendingRestore:
+    original: str
+    written: str
+    timer: threading.Timer | None = None
+
+
+class ClipboardRestorer:
+    """Restore the user's clipboard after a paste, off the critical path.
+
+    Restores run on a timer thread after ``delay`` seconds. A restore is skipped
+    when there is nothing to put back (empty original, or the paste left the
+    clipboard unchanged), coalesced when another press arrives before it fires,
+    and aborted when the clipboard no longer holds the text we wrote, i.e. the
+    user copied something else in the meantime. While the clipboard still holds
+    our own write, the next press sees the user's original content instead.
+    """
+
+    def __init__(self, delay: float = 0.05, recorder: "FlightRecorder | None" = None):
+        self.delay = delay
+        self.recorder = recorder
+        self._lock = threading.Lock()
+        self._pending: _PendingRestore | None = None
+        self._owned: tuple[str, str] | None = None
+
+    def _record(self, outcome: str, **fields: Any) -> None:
+        if self.recorder is not None:
+            self.recorder.record("restore", outcome=outcome, **fields)
+
+    def capture(self) -> tuple[str, str]:
+        """Read the clipboard, folding in any restore still pending.
+
+        Returns:
+            ``(original, current)``: the user's clipboard content and what the
+            clipboard actually holds right now.
+        """
+        with self._lock:
+            current = get_clipboard()
+            pending = self._pending
+            owned = self._owned
+            self._pending = None
+            self._owned = None
+            if pending is None:
+                if owned is not None and current == owned[1]:
+                    return owned[0], current
+                return current, current
+            pending.timer.cancel()
+            if current == pending.written:
+                self._record("coalesced")
+                return pending.original, current
+            self._record("aborted")
+            return current, current
+
+    def schedule(self, original: str, written: str) -> None:
+        """Schedule restoring ``original`` once ``written`` has been pasted."""
+        with self._lock:
+            if not original or original == written:
+                self._owned = (original, written)
+                self._record("skipped")
+                return
+
+            if self._pending is not None:
+                self._pending.timer.cancel()
+                self._record("coalesced")
+            pending = _PendingRestore(original, written)
+            pending.timer = threading.Timer(self.delay, self._fire, args=(pending,))
+            pending.timer.daemon = True
+            self._pending = pending
+            pending.timer.start()
+
+    def flush(self) -> None:
+        """Run any pending restore immediately."""
+        with self._lock:
+            pending = self._pending
+            if pending is not None:
+                pending.timer.cancel()
+                self._restore(pending)
+
+    def _fire(self, pending: _PendingRestore) -> None:
+        with self._lock:
+            if self._pending is pending:
+                self._restore(pending)
+
+    def _restore(self, pending: _PendingRestore) -> None:
+        """Write the original back unless the clipboard changed underneath. Lock held."""
+        self._pending = None
+        start = time.perf_counter()
+        try:
+            if get_clipboard() != pending.written:
+                self._record("aborted", elapsed_ms=(time.perf_counter() - start) * 1000)
+                return
+            set_clipboard(pending.original)
+            self._record("restored", elapsed_ms=(time.perf_counter() - start) * 1000)
+        except Exception as e:
+            if self.recorder is not None:
+                self.recorder.record(
+                    "error",
+                    stage="restore",
+                    error=f"{type(e).__name__}: {e}",
+                    elapsed_ms=(time.perf_counter() - start) * 1000,
+                )
+            print(f"Error restoring clipboard: {e}", file=sys.stderr)
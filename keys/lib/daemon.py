@@ -4,97 +4,263 @@ import os
 import signal
 import sys
 import time
+from pathlib import Path
 
+import yaml
 from pynput import keyboard
 
 from ..config import Config
-from .clipboard import get_clipboard, paste, set_clipboard
+from .clipboard import ClipboardRestorer, paste, set_clipboard
+from .prompts import PromptCache
+from .recorder import FlightRecorder
 from .renderer import PromptRenderer
 
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locking available
+    fcntl = None
+
+
+def to_pynput_hotkey(hotkey_key: str) -> str:
+    """Convert a config hotkey to pynput format.
+
+    Supports: ctrl, shift, alt, cmd (macOS), win (Windows).
+    Example: ctrl+shift+f, cmd+option+j, win+alt+x
+    """
+    return (
+        hotkey_key.replace("ctrl", "<ctrl>")
+        .replace("shift", "<shift>")
+        .replace("alt", "<alt>")
+        .replace("option", "<alt>")
+        .replace("cmd", "<cmd>")
+        .replace("win", "<cmd>")
+    )
+
 
 class Daemon:
-    def __init__(self):
-        self.config = Config()
-        self.pid_file_path = self.config.pid_file_path
-        self.listener = keyboard.GlobalHotKeys(self._build_hotkey_map())
+    """Serve one or more config profiles from a single hotkey listener.
+
+    Every profile's hotkeys are registered on one shared listener; a press is
+    dispatched to the binding of the currently active profile. Prompt files and
+    the renderer are shared across profiles.
+    """
+
+    def __init__(self, config_paths: list[Path] | None = None, profile: str | None = None):
+        configs = [Config(path) for path in config_paths] if config_paths else [Config()]
+        self.profiles: dict[str, Config] = {}
+        for config in configs:
+            if config.profile in self.profiles:
+                raise ValueError(f"Duplicate profile name: {config.profile}")
+            self.profiles[config.profile] = config
+
+        self.active_profile = profile or next(iter(self.profiles))
+        if self.active_profile not in self.profiles:
+            raise ValueError(f"Unknown profile: {self.active_profile}")
+
+        self.recorder = FlightRecorder()
+        self.prompts = PromptCache()
+        self.renderer = PromptRenderer()
+        self.restorer = ClipboardRestorer(recorder=self.recorder)
+        self._bindings = self._build_bindings()
+        hotkey_map = self._build_hotkey_map()
+        self._registered = set(hotkey_map)
+        self.listener = keyboard.GlobalHotKeys(hotkey_map)
         self._running = False
+        self._pid_files = []
 
-    def _build_hotkey_map(self):
-        """Convert config hotkeys to pynput format.
+    @property
+    def config(self) -> Config:
+        """Get the config of the active profile."""
+        return self.profiles[self.active_profile]
+
+    def _build_bindings(self) -> dict[str, dict[str, str]]:
+        """Map each profile to its pynput hotkey -> prompt name bindings."""
+        return {name: self._profile_bindings(config) for name, config in self.profiles.items()}
 
-        Supports: ctrl, shift, alt, cmd (macOS), win (Windows).
-        Example: ctrl+shift+f, cmd+option+j, win+alt+x
+    @staticmethod
+    def _profile_bindings(config: Config) -> dict[str, str]:
+        return {to_pynput_hotkey(key): prompt for key, prompt in config.hotkeys.items()}
+
+    def _refresh(self, name: str) -> None:
+        """Reload a profile's bindings if its config file was rewritten.
+
+        Only rebinds combinations already registered on the listener; new key
+        combinations take effect after a daemon restart.
         """
-        mapping = {}
-        for hotkey_key, prompt_name in self.config.hotkeys.items():
-            pynput_hotkey = (
-                hotkey_key.replace("ctrl", "<ctrl>")
-                .replace("shift", "<shift>")
-                .replace("alt", "<alt>")
-                .replace("option", "<alt>")
-                .replace("cmd", "<cmd>")
-                .replace("win", "<cmd>")
+        config = self.profiles[name]
+        if not config.changed():
+            return
+        try:
+            config.reload()
+        except (OSError, yaml.YAMLError) as e:
+            self.recorder.record("error", stage="reload", profile=name, error=str(e))
+            return
+        self._bindings[name] = self._profile_bindings(config)
+        self.recorder.record("reload", profile=name, generation=config.generation)
+
+        unregistered = sorted(set(self._bindings[name]) - self._registered)
+        if unregistered:
+            self.recorder.record("unregistered", profile=name, hotkeys=unregistered)
+            print(
+                f"New hotkeys in profile '{name}' need a daemon restart: {', '.join(unregistered)}",
+                file=sys.stderr,
             )
-            mapping[pynput_hotkey] = lambda pn=prompt_name: self._handle_hotkey(pn)
-        return mapping
+
+    def _build_hotkey_map(self):
+        """Register the union of all profiles' hotkeys on the shared listener."""
+        hotkeys = {hotkey for bindings in self._bindings.values() for hotkey in bindings}
+        return {hotkey: lambda hk=hotkey: self._dispatch(hk) for hotkey in hotkeys}
+
+    def _dispatch(self, hotkey):
+        """Route a press to the active profile's binding, if any."""
+        self._refresh(self.active_profile)
+        prompt_name = self._bindings[self.active_profile].get(hotkey)
+        if prompt_name is None:
+            self.recorder.record("unbound", profile=self.active_profile, hotkey=hotkey)
+            return
+        self._handle_hotkey(prompt_name)
+
+    def switch_profile(self, name: str) -> None:
+        """Make another loaded profile the active one."""
+        if name not in self.profiles:
+            raise ValueError(f"Unknown profile: {name}")
+        self.recorder.record("switch", previous=self.active_profile, profile=name)
+        self.active_profile = name
+        print(f"Switched to profile: {name}", file=sys.stderr)
 
     def _handle_hotkey(self, prompt_name):
         """Execute hotkey action: render prompt and paste into active window."""
+        clock = time.perf_counter
+        start = clock()
+        profile = self.active_profile
+        config = self.profiles[profile]
+        self.recorder.record("press", profile=profile, prompt=prompt_name)
+        original_clipboard = written_clipboard = None
         try:
-            # Save current clipboard
-            original_clipboard = get_clipboard()
+            # Save current clipboard (folding in a restore still pending from a previous press)
+            original_clipboard, current_clipboard = self.restorer.capture()
+            written_clipboard = current_clipboard
+            t_read = clock()
 
             # Load and render prompt template
-            template = self.config.load_prompt(prompt_name)
-            renderer = PromptRenderer()
-            rendered = renderer.render(template, clipboard=original_clipboard)
+            template = self.prompts.load(config, prompt_name)
+            rendered = self.renderer.render(template, clipboard=original_clipboard)
+            t_render = clock()
 
-            # Set clipboard to rendered prompt
-            set_clipboard(rendered)
+            # Set clipboard to rendered prompt, unless it already holds it
+            if rendered != current_clipboard:
+                set_clipboard(rendered)
+                written_clipboard = rendered
 
-            # Small delay to ensure clipboard is set
-            time.sleep(0.05)
+                # Small delay to ensure clipboard is set
+                time.sleep(0.05)
 
             # Paste into active window
             paste()
+            t_paste = clock()
 
-            # Small delay before restoring
-            time.sleep(0.05)
+            # Restore original clipboard in the background
+            self.restorer.schedule(original_clipboard, rendered)
 
-            # Restore original clipboard
-            set_clipboard(original_clipboard)
+            self.recorder.record(
+                "timings",
+                prompt=prompt_name,
+                read_ms=(t_read - start) * 1000,
+                render_ms=(t_render - t_read) * 1000,
+                paste_ms=(t_paste - t_render) * 1000,
+                total_ms=(t_paste - start) * 1000,
+            )
 
         except Exception as e:
+            self.recorder.record(
+                "error",
+                prompt=prompt_name,
+                error=f"{type(e).__name__}: {e}",
+                elapsed_ms=(clock() - start) * 1000,
+            )
             print(f"Error in hotkey handler: {e}", file=sys.stderr)
 
+            # Put back the restore folded in by capture() so the user's clipboard isn't lost
+            if original_clipboard is not None:
+                self.restorer.schedule(original_clipboard, written_clipboard)
+
+    def _handle_dump(self, signum, frame):
+        """Dump the flight recorder on SIGUSR1.
+
+        Writes once, to the log of the profile whose dump file was written, or to
+        the active profile's log when the signal came without a request.
+        """
+        config = self.config
+        for requested in self.profiles.values():
+            if requested.dump_file_path.exists():
+                requested.dump_file_path.unlink(missing_ok=True)
+                config = requested
+                break
+        try:
+            path = self.recorder.dump(config.flight_log_path)
+            print(f"Flight recorder dumped to {path}", file=sys.stderr)
+        except OSError as e:
+            print(f"Error dumping flight recorder: {e}", file=sys.stderr)
+
+    def _handle_switch(self, signum, frame):
+        """Activate the profile whose switch file was written, on SIGUSR2."""
+        for name, config in self.profiles.items():
+            if config.switch_file_path.exists():
+                config.switch_file_path.unlink(missing_ok=True)
+                self.switch_profile(name)
+
     def _handle_signal(self, signum, frame):
         """Handle termination signals."""
         print(f"Received signal {signum}. Shutting down daemon...", file=sys.stderr)
+        self.recorder.record("signal", signum=signum)
         self.stop()
 
     def run(self):
         """Start listening for hotkeys."""
-        if self.pid_file_path.exists():
-            print(
-                f"Error: Daemon already running. PID file exists at {self.pid_file_path}",
-                file=sys.stderr,
-            )
-            sys.exit(1)
-
-        self.pid_file_path.parent.mkdir(parents=True, exist_ok=True)
-
-        with open(self.pid_file_path, "w") as f:
-            f.write(str(os.getpid()))
+        for config in self.profiles.values():
+            if config.pid_file_path.exists():
+                print(
+                    f"Error: Daemon already running. PID file exists at {config.pid_file_path}",
+                    file=sys.stderr,
+                )
+                sys.exit(1)
 
+        # Install handlers before publishing the PID: SIGUSR1/SIGUSR2 terminate by default
         signal.signal(signal.SIGTERM, self._handle_signal)
         signal.signal(signal.SIGINT, self._handle_signal)
+        if hasattr(signal, "SIGUSR1"):
+            signal.signal(signal.SIGUSR1, self._handle_dump)
+            signal.signal(signal.SIGUSR2, self._handle_switch)
 
-        print(f"Keys daemon started (PID: {os.getpid()}). Listening for hotkeys...")
+        # Hold a lock on each PID file for our lifetime so clients can tell a live daemon from a
+        # stale file. Lock before writing: a readable PID always means the lock is held.
+        for config in self.profiles.values():
+            config.pid_file_path.parent.mkdir(parents=True, exist_ok=True)
+            f = open(config.pid_file_path, "w")  # noqa: SIM115 - kept open to hold the lock
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            f.write(str(os.getpid()))
+            f.flush()
+            self._pid_files.append(f)
+
+        print(
+            f"Keys daemon started (PID: {os.getpid()}). "
+            f"Profiles: {', '.join(self.profiles)} (active: {self.active_profile}). "
+            "Listening for hotkeys..."
+        )
         self._running = True
+        self.recorder.record(
+            "start",
+            pid=os.getpid(),
+            profiles=list(self.profiles),
+            active=self.active_profile,
+            bindings={name: len(bindings) for name, bindings in self._bindings.items()},
+        )
         try:
             self.listener.start()
             self.listener.join()
         except Exception as e:
+            self.recorder.record("error", error=f"{type(e).__name__}: {e}")
             print(f"Daemon listener error: {e}", file=sys.stderr)
         finally:
             self.stop()
@@ -106,6 +272,15 @@ class Daemon:
             self.listener.stop()
             self._running = False
 
-        if self.pid_file_path.exists():
-            self.pid_file_path.unlink()
-            print(f"Removed PID file: {self.pid_file_path}", file=sys.stderr)
+        self.restorer.flush()
+
+        for config in self.profiles.values():
+            config.switch_file_path.unlink(missing_ok=True)
+            config.dump_file_path.unlink(missing_ok=True)
+            if config.pid_file_path.exists():
+                config.pid_file_path.unlink()
+                print(f"Removed PID file: {config.pid_file_path}", file=sys.stderr)
+
+        for f in self._pid_files:
+            f.close()
+        self._pid_files = []
@@ -0,0 +1,33 @@
+"""Shared prompt file cache."""
+
+from pathlib import Path
+
+from ..config import Config
+
+
+class PromptCache:
+    """Cache prompt file contents across profiles, keyed by resolved path.
+
+    Entries are revalidated against the file's mtime on every lookup, so edits
+    to prompt files are picked up without restarting the daemon.
+    """
+
+    def __init__(self):
+        self._entries: dict[Path, tuple[int, str]] = {}
+
+    def load(self, config: Config, name: str) -> str:
+        """Load prompt content for a config, reading from disk only when changed."""
+        prompt_path = (config.prompts_dir / name).resolve()
+        try:
+            mtime = prompt_path.stat().st_mtime_ns
+        except FileNotFoundError as e:
+            self._entries.pop(prompt_path, None)
+            raise FileNotFoundError(f"Prompt not found: {config.prompts_dir / name}") from e
+
+        cached = self._entries.get(prompt_path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+        content = prompt_path.read_text().strip()
+        self._entries[prompt_path] = (mtime, content)
+        return content
@@ -0,0 +1,34 @@
+"""In-memory flight recorder for daemon diagnostics."""
+
+import json
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any
+
+
+class FlightRecorder:
+    """Fixed-size ring buffer of structured daemon events.
+
+    Recording is a single deque append, so it is cheap enough to call on every
+    hotkey press. Old events fall off the end once capacity is reached.
+    """
+
+    def __init__(self, capacity: int = 512):
+        self._events: deque[tuple[float, str, dict[str, Any]]] = deque(maxlen=capacity)
+
+    def record(self, kind: str, **fields: Any) -> None:
+        """Append an event with a wall-clock timestamp."""
+        self._events.append((time.time(), kind, fields))
+
+    def events(self) -> list[dict[str, Any]]:
+        """Return a snapshot of recorded events, oldest first."""
+        return [{"ts": ts, "kind": kind, **fields} for ts, kind, fields in list(self._events)]
+
+    def dump(self, path: Path) -> Path:
+        """Write recorded events to a JSON file."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(self.events(), f, indent=2, default=str)
+        return path
@@ -0,0 +1,50 @@
+import multiprocessing
+
+import yaml
+
+from keys.config import Config
+
+WRITERS = 8
+KEYS_PER_WRITER = 15
+
+
+def _add_keys(config_path, writer):
+    for i in range(KEYS_PER_WRITER):
+        Config(config_path).add_hotkey(f"ctrl+{writer}+{i}", f"prompt-{writer}-{i}")
+
+
+def _remove_keys(config_path, writer):
+    for i in range(KEYS_PER_WRITER):
+        Config(config_path).remove_hotkey(f"ctrl+{writer}+{i}")
+
+
+def _run_writers(target, config_path):
+    processes = [
+        multiprocessing.Process(target=target, args=(config_path, writer))
+        for writer in range(WRITERS)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(timeout=60)
+        assert process.exitcode == 0
+
+
+def test_parallel_writers_lose_no_updates(tmp_path):
+    """Parallel add/remove processes should neither lose updates nor corrupt the file."""
+    config_path = tmp_path / "config.yaml"
+    Config(config_path)
+
+    _run_writers(_add_keys, config_path)
+
+    config = Config(config_path)
+    assert len(config.hotkeys) == WRITERS * KEYS_PER_WRITER
+    assert config.generation == WRITERS * KEYS_PER_WRITER
+
+    _run_writers(_remove_keys, config_path)
+
+    config = Config(config_path)
+    assert config.hotkeys == {}
+    assert config.generation == 2 * WRITERS * KEYS_PER_WRITER
+    assert yaml.safe_load(config_path.read_text())["hotkeys"] == {}
+    assert not list(tmp_path.glob(".config.yaml.*.tmp"))
@@ -1,9 +1,11 @@
 import subprocess
+import time
 from unittest.mock import patch
 
 import pytest
 
-from keys.lib.clipboard import get_clipboard, paste, set_clipboard
+from keys.lib.clipboard import ClipboardRestorer, get_clipboard, paste, set_clipboard
+from keys.lib.recorder import FlightRecorder
 
 
 @pytest.fixture(autouse=True)
@@ -107,3 +109,149 @@ def test_paste_unsupported_platform(mock_platform_system):
     mock_platform_system.return_value = "Windows"
     with pytest.raises(NotImplementedError, match="Platform not supported: Windows"):
         paste()
+
+
+class FakeClipboard:
+    """In-memory clipboard that counts writes."""
+
+    def __init__(self, text=""):
+        self.text = text
+        self.writes = 0
+
+    def get(self):
+        return self.text
+
+    def set(self, text):
+        self.text = text
+        self.writes += 1
+
+
+@pytest.fixture
+def fake_clipboard():
+    clipboard = FakeClipboard("original")
+    with (
+        patch("keys.lib.clipboard.get_clipboard", side_effect=clipboard.get),
+        patch("keys.lib.clipboard.set_clipboard", side_effect=clipboard.set),
+    ):
+        yield clipboard
+
+
+def test_restorer_restores_original(fake_clipboard):
+    restorer = ClipboardRestorer(delay=60)
+    original, _ = restorer.capture()
+    fake_clipboard.set("rendered")
+
+    restorer.schedule(original, "rendered")
+    restorer.flush()
+
+    assert fake_clipboard.text == "original"
+
+
+def test_restorer_skips_empty_original(fake_clipboard):
+    fake_clipboard.text = ""
+    restorer = ClipboardRestorer(delay=60)
+    original, _ = restorer.capture()
+    fake_clipboard.set("rendered")
+
+    restorer.schedule(original, "rendered")
+    restorer.flush()
+
+    assert fake_clipboard.writes == 1
+    assert restorer.capture() == ("", "rendered")
+
+
+def test_restorer_skips_identical_text(fake_clipboard):
+    restorer = ClipboardRestorer(delay=60)
+    original, current = restorer.capture()
+
+    restorer.schedule(original, current)
+    restorer.flush()
+
+    assert fake_clipboard.writes == 0
+
+
+def test_restorer_aborts_when_user_copies(fake_clipboard):
+    restorer = ClipboardRestorer(delay=60)
+    original, _ = restorer.capture()
+    fake_clipboard.set("rendered")
+    restorer.schedule(original, "rendered")
+
+    fake_clipboard.set("copied by user")
+    restorer.flush()
+
+    assert fake_clipboard.text == "copied by user"
+
+
+def test_restorer_coalesces_back_to_back_presses(fake_clipboard):
+    restorer = ClipboardRestorer(delay=60)
+    original, _ = restorer.capture()
+    fake_clipboard.set("first")
+    restorer.schedule(original, "first")
+
+    original, current = restorer.capture()
+    assert (original, current) == ("original", "first")
+    fake_clipboard.set("second")
+    restorer.schedule(original, "second")
+    restorer.flush()
+
+    assert fake_clipboard.text == "original"
+    assert fake_clipboard.writes == 3
+
+
+def test_restorer_restores_after_delay(fake_clipboard):
+    restorer = ClipboardRestorer(delay=0.01)
+    original, _ = restorer.capture()
+    fake_clipboard.set("rendered")
+
+    restorer.schedule(original, "rendered")
+    deadline = time.monotonic() + 1
+    while fake_clipboard.text != "original" and time.monotonic() < deadline:
+        time.sleep(0.005)
+
+    assert fake_clipboard.text == "original"
+
+
+def test_restorer_reschedule_after_failed_press(fake_clipboard):
+    """A press that fails after folding in a pending restore must not lose the original."""
+    fake_clipboard.text = "user-data"
+    restorer = ClipboardRestorer(delay=60)
+    original, _ = restorer.capture()
+    fake_clipboard.set("renderedA")
+    restorer.schedule(original, "renderedA")
+
+    original, current = restorer.capture()
+    assert original == "user-data"
+    restorer.schedule(original, current)
+    restorer.flush()
+
+    assert fake_clipboard.text == "user-data"
+    assert restorer.capture() == ("user-data", "user-data")
+
+
+def test_restorer_records_restore_time(fake_clipboard):
+    recorder = FlightRecorder()
+    restorer = ClipboardRestorer(delay=60, recorder=recorder)
+    original, _ = restorer.capture()
+    fake_clipboard.set("rendered")
+
+    restorer.schedule(original, "rendered")
+    restorer.flush()
+
+    [event] = recorder.events()
+    assert event["outcome"] == "restored"
+    assert event["elapsed_ms"] >= 0
+
+
+def test_restorer_records_restore_error_time(fake_clipboard):
+    recorder = FlightRecorder()
+    restorer = ClipboardRestorer(delay=60, recorder=recorder)
+    original, _ = restorer.capture()
+    fake_clipboard.set("rendered")
+    restorer.schedule(original, "rendered")
+
+    with patch("keys.lib.clipboard.set_clipboard", side_effect=OSError("xclip died")):
+        restorer.flush()
+
+    [event] = recorder.events()
+    assert (event["kind"], event["stage"]) == ("error", "restore")
+    assert event["elapsed_ms"] >= 0
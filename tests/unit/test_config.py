@@ -1,8 +1,10 @@
+import stat
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 
-from keys.config import Config
+from keys.config import Config, ConfigConflictError
 
 
 @pytest.fixture
@@ -121,3 +123,118 @@ def test_get_hotkey(tmp_config_dir, prompts_dir):
 
     assert config.get_hotkey("ctrl+shift+f") == "fix"
     assert config.get_hotkey("nonexistent") is None
+
+
+def test_default_profile_keeps_legacy_state_paths(tmp_config_dir):
+    """Default config should keep the original PID file name."""
+    config = Config(tmp_config_dir / "config.yaml")
+
+    assert config.profile == "config"
+    assert config.pid_file_path == tmp_config_dir / "keys_daemon.pid"
+
+
+def test_named_profile_isolates_state_paths(tmp_config_dir):
+    """Named profiles should get their own PID, switch and log files."""
+    default = Config(tmp_config_dir / "config.yaml")
+    work = Config(tmp_config_dir / "work.yaml")
+
+    assert work.profile == "work"
+    assert work.pid_file_path == tmp_config_dir / "keys_daemon.work.pid"
+    assert work.pid_file_path != default.pid_file_path
+    assert work.switch_file_path != default.switch_file_path
+    assert work.flight_log_path != default.flight_log_path
+
+
+def test_writes_bump_generation(tmp_config_dir, prompts_dir):
+    """Every write should increment the generation counter."""
+    config = Config(tmp_config_dir / "config.yaml")
+    assert config.generation == 0
+
+    config.set_prompts_dir(prompts_dir)
+    config.add_hotkey("ctrl+shift+f", "fix")
+
+    assert config.generation == 2
+    assert Config(tmp_config_dir / "config.yaml").generation == 2
+
+
+def test_update_merges_concurrent_changes(tmp_config_dir):
+    """Mutators should apply on top of changes made by other writers."""
+    config_path = tmp_config_dir / "config.yaml"
+    first = Config(config_path)
+    second = Config(config_path)
+
+    first.add_hotkey("ctrl+shift+f", "fix")
+    second.add_hotkey("ctrl+shift+c", "commit")
+
+    assert Config(config_path).hotkeys == {"ctrl+shift+f": "fix", "ctrl+shift+c": "commit"}
+
+
+def test_save_rejects_stale_config(tmp_config_dir):
+    """save() should refuse to overwrite a newer generation."""
+    config_path = tmp_config_dir / "config.yaml"
+    stale = Config(config_path)
+    Config(config_path).add_hotkey("ctrl+shift+f", "fix")
+
+    stale._data["hotkeys"]["ctrl+shift+c"] = "commit"
+    with pytest.raises(ConfigConflictError, match="changed on disk"):
+        stale.save()
+
+    assert Config(config_path).hotkeys == {"ctrl+shift+f": "fix"}
+
+
+def test_changed_detects_rewrite(tmp_config_dir):
+    """changed() should notice writes by other instances and clear on reload."""
+    config_path = tmp_config_dir / "config.yaml"
+    reader = Config(config_path)
+    assert not reader.changed()
+
+    Config(config_path).add_hotkey("ctrl+shift+f", "fix")
+
+    assert reader.changed()
+    reader.reload()
+    assert not reader.changed()
+    assert reader.get_hotkey("ctrl+shift+f") == "fix"
+
+
+def test_save_preserves_symlink_and_mode(tmp_config_dir, tmp_path):
+    """Atomic saves should write through a symlinked config and keep its permissions."""
+    real_path = tmp_path / "dotfiles" / "config.yaml"
+    real_path.parent.mkdir()
+    Config(real_path)
+    real_path.chmod(0o600)
+    link_path = tmp_config_dir / "config.yaml"
+    link_path.symlink_to(real_path)
+
+    Config(link_path).add_hotkey("ctrl+shift+f", "fix")
+
+    assert link_path.is_symlink()
+    assert Config(real_path).hotkeys == {"ctrl+shift+f": "fix"}
+    assert stat.S_IMODE(real_path.stat().st_mode) == 0o600
+
+
+def test_failed_write_leaves_no_temp_file(tmp_config_dir):
+    """A write that fails mid-dump should clean up its temp file and keep the config."""
+    config_path = tmp_config_dir / "config.yaml"
+    config = Config(config_path)
+
+    with patch("yaml.safe_dump", side_effect=OSError("disk full")):
+        with pytest.raises(OSError, match="disk full"):
+            config.add_hotkey("ctrl+shift+f", "fix")
+
+    assert not list(tmp_config_dir.glob(".config.yaml.*.tmp"))
+    assert Config(config_path).hotkeys == {}
+    assert config.hotkeys == {}
+    assert config.generation == 0
+
+
+def test_remove_missing_hotkey_does_not_write(tmp_config_dir):
+    """Removing an unbound key should not rewrite the file or bump the generation."""
+    config_path = tmp_config_dir / "config.yaml"
+    config = Config(config_path)
+    config.add_hotkey("ctrl+shift+f", "fix")
+    reader = Config(config_path)
+
+    config.remove_hotkey("nonexistent")
+
+    assert config.generation == 1
+    assert not reader.changed()
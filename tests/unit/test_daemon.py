@@ -0,0 +1,337 @@
+import fcntl
+import json
+import signal
+import sys
+import types
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from keys.config import Config
+
+
+@pytest.fixture
+def daemon_module():
+    """Import the daemon with pynput's GlobalHotKeys replaced (no X display needed)."""
+    keyboard = types.ModuleType("pynput.keyboard")
+    keyboard.GlobalHotKeys = MagicMock()
+    pynput = types.ModuleType("pynput")
+    pynput.keyboard = keyboard
+    with patch.dict(sys.modules, {"pynput": pynput, "pynput.keyboard": keyboard}):
+        sys.modules.pop("keys.lib.daemon", None)
+        from keys.lib import daemon
+
+        yield daemon
+
+
+@pytest.fixture
+def config_paths(tmp_path):
+    """Create a default and a work profile sharing one hotkey."""
+    default = Config(tmp_path / "config.yaml")
+    default.add_hotkey("ctrl+shift+f", "fix")
+    work = Config(tmp_path / "work.yaml")
+    work.add_hotkey("ctrl+shift+f", "review")
+    work.add_hotkey("ctrl+shift+c", "commit")
+    return [default.path, work.path]
+
+
+@pytest.fixture
+def daemon(daemon_module, config_paths):
+    daemon = daemon_module.Daemon(config_paths)
+    daemon._handle_hotkey = MagicMock()
+    return daemon
+
+
+def test_registers_union_of_profile_hotkeys(daemon_module, config_paths):
+    """All profiles' hotkeys should be registered on one listener."""
+    daemon_module.Daemon(config_paths)
+
+    hotkey_map = daemon_module.keyboard.GlobalHotKeys.call_args.args[0]
+    assert set(hotkey_map) == {"<ctrl>+<shift>+f", "<ctrl>+<shift>+c"}
+
+
+def test_dispatch_uses_active_profile(daemon):
+    """A press should resolve against the active profile only."""
+    assert daemon.active_profile == "config"
+    daemon._dispatch("<ctrl>+<shift>+f")
+    daemon._handle_hotkey.assert_called_once_with("fix")
+
+    daemon.switch_profile("work")
+    daemon._dispatch("<ctrl>+<shift>+f")
+    daemon._handle_hotkey.assert_called_with("review")
+
+
+def test_dispatch_unbound_in_active_profile(daemon):
+    """A hotkey bound only in another profile should be ignored and recorded."""
+    daemon._dispatch("<ctrl>+<shift>+c")
+
+    daemon._handle_hotkey.assert_not_called()
+    assert daemon.recorder.events()[-1]["kind"] == "unbound"
+
+
+def test_initial_profile_option(daemon_module, config_paths):
+    """The initially active profile should be selectable."""
+    assert daemon_module.Daemon(config_paths, "work").active_profile == "work"
+    with pytest.raises(ValueError, match="Unknown profile"):
+        daemon_module.Daemon(config_paths, "missing")
+
+
+def test_duplicate_profile_names_rejected(daemon_module, tmp_path):
+    """Two configs with the same file name should not be loaded together."""
+    (tmp_path / "a").mkdir()
+    (tmp_path / "b").mkdir()
+    with pytest.raises(ValueError, match="Duplicate profile"):
+        daemon_module.Daemon([tmp_path / "a" / "work.yaml", tmp_path / "b" / "work.yaml"])
+
+
+def test_switch_profile_unknown(daemon):
+    """Switching to a profile that is not loaded should fail."""
+    with pytest.raises(ValueError, match="Unknown profile"):
+        daemon.switch_profile("missing")
+    assert daemon.active_profile == "config"
+
+
+def test_handle_switch_consumes_switch_file(daemon):
+    """SIGUSR2 should activate the profile whose switch file exists."""
+    switch_file = daemon.profiles["work"].switch_file_path
+    switch_file.touch()
+
+    daemon._handle_switch(signal.SIGUSR2, None)
+
+    assert daemon.active_profile == "work"
+    assert not switch_file.exists()
+
+
+def test_handle_switch_without_request(daemon):
+    """SIGUSR2 without a switch file should leave the active profile alone."""
+    daemon._handle_switch(signal.SIGUSR2, None)
+
+    assert daemon.active_profile == "config"
+
+
+def test_run_refuses_when_any_profile_pid_exists(daemon):
+    """run() should exit if any profile already has a PID file."""
+    daemon.profiles["work"].pid_file_path.write_text("12345")
+
+    with pytest.raises(SystemExit) as exc:
+        daemon.run()
+
+    assert exc.value.code == 1
+    assert not daemon.profiles["config"].pid_file_path.exists()
+    daemon.listener.start.assert_not_called()
+
+
+@pytest.fixture
+def clipboard(daemon_module, config_paths, tmp_path):
+    """Give the default profile a 'fix' prompt and back the clipboard with a dict."""
+    prompts_dir = tmp_path / "prompts"
+    prompts_dir.mkdir()
+    (prompts_dir / "fix").write_text("Fix {clipboard}")
+    Config(config_paths[0]).set_prompts_dir(prompts_dir)
+    clipboard = {"text": "user-data"}
+
+    def set_text(text):
+        clipboard["text"] = text
+
+    with (
+        patch("keys.lib.clipboard.get_clipboard", side_effect=lambda: clipboard["text"]),
+        patch("keys.lib.clipboard.set_clipboard", side_effect=set_text),
+        patch.object(daemon_module, "set_clipboard", side_effect=set_text),
+        patch.object(daemon_module, "paste"),
+        patch.object(daemon_module.time, "sleep"),
+    ):
+        yield clipboard
+
+
+def test_press_records_stage_timings(daemon_module, config_paths, clipboard):
+    """A successful press should record the press and its stage timings."""
+    daemon = daemon_module.Daemon(config_paths)
+    daemon.restorer.delay = 60
+
+    daemon._handle_hotkey("fix")
+
+    events = daemon.recorder.events()
+    press = events[0]
+    assert (press["kind"], press["profile"], press["prompt"]) == ("press", "config", "fix")
+    [timings] = [e for e in events if e["kind"] == "timings"]
+    assert timings["prompt"] == "fix"
+    for stage in ("read_ms", "render_ms", "paste_ms", "total_ms"):
+        assert timings[stage] >= 0
+
+
+def test_failed_press_records_error(daemon_module, config_paths, clipboard):
+    """A press whose prompt fails to load should record an error instead of only printing it."""
+    daemon = daemon_module.Daemon(config_paths)
+
+    daemon._handle_hotkey("missing")
+
+    [error] = [e for e in daemon.recorder.events() if e["kind"] == "error"]
+    assert error["prompt"] == "missing"
+    assert error["error"].startswith("FileNotFoundError: Prompt not found")
+    assert error["elapsed_ms"] >= 0
+    assert "timings" not in [e["kind"] for e in daemon.recorder.events()]
+
+
+def test_failed_press_keeps_pending_restore(daemon_module, config_paths, clipboard):
+    """A press that fails inside the restore window should still restore the clipboard."""
+    daemon = daemon_module.Daemon(config_paths)
+    daemon.restorer.delay = 60
+
+    daemon._handle_hotkey("fix")
+    assert clipboard["text"] == "Fix user-data"
+
+    daemon._handle_hotkey("missing")
+    daemon.restorer.flush()
+
+    assert clipboard["text"] == "user-data"
+    assert daemon.recorder.events()[-1]["kind"] == "restore"
+
+
+def test_handle_dump_writes_active_profile_log(daemon):
+    """A bare SIGUSR1 should dump once, to the active profile's log."""
+    daemon.recorder.record("press", prompt="fix")
+
+    daemon._handle_dump(signal.SIGUSR1, None)
+
+    config, work = daemon.profiles["config"], daemon.profiles["work"]
+    assert json.loads(config.flight_log_path.read_text())[0]["kind"] == "press"
+    assert not work.flight_log_path.exists()
+
+
+def test_handle_dump_honours_request_file(daemon):
+    """A dump requested for a profile should go to that profile's log only."""
+    work = daemon.profiles["work"]
+    work.dump_file_path.touch()
+
+    daemon._handle_dump(signal.SIGUSR1, None)
+
+    assert work.flight_log_path.exists()
+    assert not work.dump_file_path.exists()
+    assert not daemon.profiles["config"].flight_log_path.exists()
+
+
+def test_dump_daemon_without_pid_file(api, config_paths):
+    """keys dump should fail cleanly when no daemon is running."""
+    config = Config(config_paths[0])
+
+    with pytest.raises(ValueError, match="PID file not found"):
+        api.dump_daemon(config_paths[0])
+
+    assert not config.dump_file_path.exists()
+
+
+def test_dump_daemon_signals_live_daemon(api, config_paths, live_pid_file):
+    """keys dump should request a dump and report the profile's log path."""
+    config = Config(config_paths[0])
+
+    with patch.object(api.os, "kill") as kill:
+        message = api.dump_daemon(config_paths[0])
+
+    kill.assert_called_once_with(4242, signal.SIGUSR1)
+    assert config.dump_file_path.exists()
+    assert str(config.flight_log_path) in message
+
+
+def test_refresh_rebinds_registered_hotkeys(daemon, config_paths):
+    """A rewritten config should rebind hotkeys the listener already handles."""
+    Config(config_paths[0]).add_hotkey("ctrl+shift+f", "explain")
+
+    daemon._dispatch("<ctrl>+<shift>+f")
+
+    daemon._handle_hotkey.assert_called_once_with("explain")
+    assert "reload" in [e["kind"] for e in daemon.recorder.events()]
+
+
+def test_refresh_reports_unregistered_hotkeys(daemon, config_paths):
+    """Hotkeys added while running should be reported as needing a restart."""
+    Config(config_paths[0]).add_hotkey("ctrl+shift+x", "explain")
+
+    daemon._dispatch("<ctrl>+<shift>+f")
+
+    [event] = [e for e in daemon.recorder.events() if e["kind"] == "unregistered"]
+    assert event["hotkeys"] == ["<ctrl>+<shift>+x"]
+
+
+@pytest.fixture
+def api(daemon_module):
+    """Import the api module against the patched daemon."""
+    sys.modules.pop("keys.api", None)
+    from keys import api
+
+    return api
+
+
+@pytest.fixture
+def live_pid_file(config_paths):
+    """Write a PID file and hold its lock, as a running daemon does."""
+    pid_file = Config(config_paths[0]).pid_file_path
+    with open(pid_file, "w") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        f.write("4242")
+        f.flush()
+        yield pid_file
+
+
+def test_stale_pid_file_is_not_signalled(api, config_paths):
+    """A PID file nobody holds the lock on should be removed, not signalled."""
+    pid_file = Config(config_paths[0]).pid_file_path
+    pid_file.write_text("4242")
+
+    with patch.object(api.os, "kill") as kill:
+        with pytest.raises(ValueError, match="stale PID file"):
+            api.stop_daemon(config_paths[0])
+
+    kill.assert_not_called()
+    assert not pid_file.exists()
+
+
+def test_locked_pid_file_is_signalled(api, config_paths, live_pid_file):
+    """A PID file locked by a live daemon should be signalled."""
+    with patch.object(api.os, "kill") as kill:
+        api.stop_daemon(config_paths[0])
+
+    kill.assert_called_once_with(4242, signal.SIGTERM)
+
+
+def test_run_holds_pid_file_lock(daemon, api):
+    """A running daemon should hold the lock on every profile's PID file."""
+    held = {}
+
+    def join():
+        for name, config in daemon.profiles.items():
+            held[name] = api._daemon_holds_lock(config.pid_file_path)
+
+    daemon.listener.join.side_effect = join
+    with patch.object(signal, "signal"):
+        daemon.run()
+
+    assert held == {"config": True, "work": True}
+    assert not daemon.profiles["config"].pid_file_path.exists()
+
+
+def test_switch_profile_refuses_stale_pid_file(api, config_paths):
+    """keys switch should not send SIGUSR2 through a stale PID file."""
+    work = Config(config_paths[1])
+    work.pid_file_path.write_text("4242")
+
+    with patch.object(api.os, "kill") as kill:
+        with pytest.raises(ValueError, match="stale PID file"):
+            api.switch_profile(config_paths[1])
+
+    kill.assert_not_called()
+    assert not work.pid_file_path.exists()
+    assert not work.switch_file_path.exists()
+
+
+def test_start_daemon_accepts_single_config_path(api, config_paths):
+    """start_daemon should still accept one config path, as before profiles existed."""
+    with patch.object(api, "Daemon") as daemon_cls:
+        api.start_daemon(config_paths[0])
+        api.start_daemon(config_path=config_paths[0], profile="config")
+        api.start_daemon(config_paths)
+
+    assert [c.args for c in daemon_cls.call_args_list] == [
+        ([config_paths[0]], None),
+        ([config_paths[0]], "config"),
+        (config_paths, None),
+    ]
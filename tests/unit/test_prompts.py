@@ -0,0 +1,60 @@
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from keys.config import Config
+from keys.lib.prompts import PromptCache
+
+
+@pytest.fixture
+def config(tmp_path):
+    """Create a config pointing at a temporary prompts directory."""
+    prompts_dir = tmp_path / "prompts"
+    prompts_dir.mkdir()
+    config = Config(tmp_path / "config.yaml")
+    config.set_prompts_dir(prompts_dir)
+    return config
+
+
+def test_load_matches_config(config):
+    """Cache should return the same content as Config.load_prompt."""
+    (config.prompts_dir / "fix").write_text("Fix this:\n")
+
+    assert PromptCache().load(config, "fix") == config.load_prompt("fix")
+
+
+def test_load_picks_up_changes(config):
+    """Cache should reread a prompt when its mtime changes."""
+    prompt = config.prompts_dir / "fix"
+    prompt.write_text("old")
+    cache = PromptCache()
+    assert cache.load(config, "fix") == "old"
+
+    prompt.write_text("new")
+    stat = prompt.stat()
+    os.utime(prompt, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    assert cache.load(config, "fix") == "new"
+
+
+def test_load_shared_across_profiles(config, tmp_path):
+    """Profiles pointing at the same prompts should share cache entries."""
+    (config.prompts_dir / "fix").write_text("Fix")
+    other = Config(tmp_path / "work.yaml")
+    other.set_prompts_dir(config.prompts_dir)
+    cache = PromptCache()
+    read_text = Path.read_text
+
+    with patch.object(Path, "read_text", autospec=True, side_effect=read_text) as reads:
+        assert cache.load(config, "fix") == "Fix"
+        assert cache.load(other, "fix") == "Fix"
+
+    assert reads.call_count == 1
+
+
+def test_load_missing_prompt(config):
+    """Cache should raise FileNotFoundError for missing prompts."""
+    with pytest.raises(FileNotFoundError, match="Prompt not found"):
+        PromptCache().load(config, "nonexistent")
@@ -0,0 +1,36 @@
+import json
+
+from keys.lib.recorder import FlightRecorder
+
+
+def test_record_keeps_fields_in_order():
+    """Recorder should return events oldest first with their fields."""
+    recorder = FlightRecorder()
+    recorder.record("press", prompt="fix")
+    recorder.record("error", prompt="fix", error="boom")
+
+    events = recorder.events()
+    assert [e["kind"] for e in events] == ["press", "error"]
+    assert events[1]["error"] == "boom"
+    assert "ts" in events[0]
+
+
+def test_record_drops_oldest_when_full():
+    """Recorder should keep only the most recent events."""
+    recorder = FlightRecorder(capacity=3)
+    for i in range(5):
+        recorder.record("press", n=i)
+
+    assert [e["n"] for e in recorder.events()] == [2, 3, 4]
+
+
+def test_dump_writes_json(tmp_path):
+    """Recorder should dump events to a JSON file."""
+    recorder = FlightRecorder()
+    recorder.record("press", prompt="fix")
+
+    path = recorder.dump(tmp_path / "sub" / "flight.json")
+
+    data = json.loads(path.read_text())
+    assert data[0]["kind"] == "press"
+    assert data[0]["prompt"] == "fix"